@@ -12,111 +12,94 @@ import sys
 import os
 import argparse
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib
-import math
 
-# 日本語フォント設定（Mac用）
-matplotlib.rcParams['font.family'] = 'Hiragino Sans'
+# ファイル出力のみなのでGUIバックエンドは初期化しない
+# （図中の文字列は英語のみのため、日本語フォントの設定も不要）
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
 
 # ライブラリのパスを追加（開発時用）
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ydlidar_tmini import LaserScan, LaserPoint
+from ydlidar_tmini import LaserScan
 
 
 def generate_demo_scan() -> LaserScan:
     """デモスキャンデータを生成"""
-    points = []
-
     # 360度をカバーする測定点を生成
     num_points = 400
-    for i in range(num_points):
-        angle = (i * 360.0 / num_points) % 360.0
-
-        # 複数の物体をシミュレート
-        distance = simulate_environment(angle)
+    angles = np.linspace(0.0, 360.0, num_points, endpoint=False, dtype=np.float32)
 
-        # 距離に基づいて強度を計算（近いほど強い）
-        if distance > 0:
-            intensity = int(255 * (1.0 - min(distance / 10.0, 1.0)))
-        else:
-            intensity = 0
+    # 複数の物体をシミュレート
+    distances = simulate_environment(angles)
 
-        points.append(LaserPoint(
-            angle=angle,
-            distance=distance,
-            intensity=intensity
-        ))
+    # 距離に基づいて強度を計算（近いほど強い）
+    intensities = np.where(distances > 0, np.clip(255.0 * (1.0 - distances / 10.0), 0, 255), 0).astype(np.uint8)
 
     import time
     return LaserScan(
-        points=points,
+        angles_deg=angles,
+        distances_m=distances,
+        intensities=intensities,
         scan_frequency=6.0,
-        timestamp=time.time()
+        timestamp=time.monotonic()
     )
 
 
-def simulate_environment(angle: float) -> float:
-    """環境をシミュレート（複数の物体）"""
-
-    # 物体1: 正面の壁（90度付近）
-    if 60 <= angle <= 120:
-        wall_distance = 2.5 + 0.3 * math.sin(math.radians(angle * 4))
-        return wall_distance
-
-    # 物体2: 右側の柱（45度付近）
-    angle_diff = abs(angle - 45)
-    if angle_diff < 10:
-        pillar_distance = 1.5 + 0.5 * (angle_diff / 10.0)
-        return pillar_distance
-
-    # 物体3: 左側の柱（135度付近）
-    angle_diff = abs(angle - 135)
-    if angle_diff < 10:
-        pillar_distance = 1.5 + 0.5 * (angle_diff / 10.0)
-        return pillar_distance
-
-    # 物体4: 後方の壁（270度付近）
-    if 240 <= angle <= 300:
-        back_wall_distance = 4.0 + 0.5 * math.cos(math.radians(angle * 3))
-        return back_wall_distance
-
-    # 物体5: 床（下方向、180度付近）
-    if 150 <= angle <= 210:
-        floor_distance = 1.0 + 0.2 * math.sin(math.radians(angle * 6))
-        return floor_distance
-
-    # その他: ランダムなノイズ（遠方）
-    if np.random.random() < 0.1:
-        return 8.0 + np.random.random() * 2.0
-
-    # 検出なし
-    return 0.0
+def simulate_environment(angles: np.ndarray) -> np.ndarray:
+    """環境をシミュレート（複数の物体、角度配列に対してベクトル演算）"""
+
+    conditions = [
+        # 物体1: 正面の壁（90度付近）
+        (angles >= 60) & (angles <= 120),
+        # 物体2: 右側の柱（45度付近）
+        np.abs(angles - 45) < 10,
+        # 物体3: 左側の柱（135度付近）
+        np.abs(angles - 135) < 10,
+        # 物体4: 後方の壁（270度付近）
+        (angles >= 240) & (angles <= 300),
+        # 物体5: 床（下方向、180度付近）
+        (angles >= 150) & (angles <= 210),
+    ]
+    choices = [
+        2.5 + 0.3 * np.sin(np.radians(angles * 4)),
+        1.5 + 0.5 * (np.abs(angles - 45) / 10.0),
+        1.5 + 0.5 * (np.abs(angles - 135) / 10.0),
+        4.0 + 0.5 * np.cos(np.radians(angles * 3)),
+        1.0 + 0.2 * np.sin(np.radians(angles * 6)),
+    ]
+
+    # その他: ランダムなノイズ（遠方）、それ以外は検出なし
+    # 判定用と距離用の乱数は全角度分を1回の呼び出しでまとめて生成
+    noise_hit, noise_offset = np.random.random((2,) + angles.shape)
+    noise = np.where(noise_hit < 0.1, 8.0 + noise_offset * 2.0, 0.0).astype(np.float32)
+
+    return np.select(conditions, choices, default=noise)
 
 
 def create_visualization(scan: LaserScan, output_path: str, max_range: float = 10.0):
     """可視化画像を生成"""
 
-    # 有効なポイントのみ抽出
-    points = scan.get_valid_points()
-
-    if len(points) == 0:
+    if scan.n_valid == 0:
         print("有効なデータポイントがありません")
         return
 
-    # データ抽出
-    angles = np.array([np.radians(p.angle) for p in points])
-    distances = np.array([p.distance for p in points])
-    intensities = np.array([p.intensity for p in points])
+    # 有効なポイントのみ抽出（マスクはスキャン側でキャッシュ済み）
+    valid_mask = scan.valid_mask
+    angles = scan.angles_rad[valid_mask]
+    distances = scan.distances_m[valid_mask]
+    intensities = scan.intensities[valid_mask]
+    num_valid = scan.n_valid
 
-    # 距離範囲でフィルタ
-    valid_mask = (distances > 0) & (distances <= max_range)
-    angles = angles[valid_mask]
-    distances = distances[valid_mask]
-    intensities = intensities[valid_mask]
+    # 距離範囲でフィルタ（距離 > 0 は抽出済み）
+    range_mask = distances <= max_range
+    angles = angles[range_mask]
+    distances = distances[range_mask]
+    intensities = intensities[range_mask]
 
     # プロット作成
+    dpi = 150  # 出力解像度
     fig, ax = plt.subplots(figsize=(12, 12), subplot_kw=dict(projection='polar'))
 
     # 設定
@@ -126,8 +109,14 @@ def create_visualization(scan: LaserScan, output_path: str, max_range: float = 1
     ax.set_title('YDLiDAR T-mini Pro - Demo Scan', pad=20, fontsize=16, fontweight='bold')
     ax.grid(True, alpha=0.3, linewidth=1.5)
 
-    # 測定点をプロット
-    scatter = ax.scatter(angles, distances, c=distances, s=20, cmap='jet', alpha=0.8, edgecolors='black', linewidth=0.5)
+    # 描画点数が極座標の円周ピクセル数を超える場合は間引く
+    # （出力解像度で区別できない点を描いても描画時間が増えるだけのため）
+    point_budget = int(np.pi * ax.bbox.width * dpi / fig.dpi)
+    step = max(1, -(-len(distances) // point_budget))
+
+    # 測定点をプロット（PDF/SVG出力でも点群は1枚の画像として埋め込む）
+    scatter = ax.scatter(angles[::step], distances[::step], c=distances[::step], s=20, cmap='jet', alpha=0.8,
+                         edgecolors='black', linewidth=0.5, rasterized=True)
 
     # カラーバー
     cbar = plt.colorbar(scatter, ax=ax, pad=0.1)
@@ -135,8 +124,8 @@ def create_visualization(scan: LaserScan, output_path: str, max_range: float = 1
 
     # 統計情報
     stats_text = f"Scan Statistics:\n"
-    stats_text += f"  Total Points: {len(scan.points)}\n"
-    stats_text += f"  Valid Points: {len(points)}\n"
+    stats_text += f"  Total Points: {len(scan)}\n"
+    stats_text += f"  Valid Points: {num_valid}\n"
     stats_text += f"  Scan Frequency: {scan.scan_frequency:.1f} Hz\n"
     stats_text += f"  Distance Range: {distances.min():.2f} - {distances.max():.2f} m\n"
     stats_text += f"  Mean Distance: {distances.mean():.2f} m\n"
@@ -147,10 +136,10 @@ def create_visualization(scan: LaserScan, output_path: str, max_range: float = 1
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
     # 保存
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
     print(f"画像を保存しました: {output_path}")
-    print(f"  画像サイズ: {fig.get_size_inches()[0]*150:.0f} x {fig.get_size_inches()[1]*150:.0f} pixels")
-    print(f"  測定点数: {len(points)}")
+    print(f"  画像サイズ: {fig.get_size_inches()[0]*dpi:.0f} x {fig.get_size_inches()[1]*dpi:.0f} pixels")
+    print(f"  測定点数: {num_valid}")
 
     plt.close()
 
@@ -168,8 +157,8 @@ def main():
     scan = generate_demo_scan()
 
     print(f"スキャンデータ生成完了:")
-    print(f"  測定点数: {len(scan.points)}")
-    print(f"  有効点数: {len(scan.get_valid_points())}")
+    print(f"  測定点数: {len(scan)}")
+    print(f"  有効点数: {scan.n_valid}")
     print(f"  スキャン周波数: {scan.scan_frequency} Hz")
 
     # 可視化画像生成
@@ -22,13 +22,69 @@ import matplotlib
 import time
 import math
 
+try:
+    from numba import njit
+except ImportError:
+    # numbaが無い場合はNumPy版のシミュレーションを使用
+    njit = None
+
 # 日本語フォント設定（Mac用）
 matplotlib.rcParams['font.family'] = 'Hiragino Sans'
 
 # ライブラリのパスを追加（開発時用）
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ydlidar_tmini import TMiniDriver, LaserScan, LaserPoint
+from ydlidar_tmini import TMiniDriver, LaserScan
+
+
+def _simulate_environment_kernel(angles, wall_mask, wall_env, floor_mask, floor_env, t, out):
+    """
+    環境シミュレーションのループ版（numbaでJITコンパイルして使用）
+
+    DemoLidarGenerator._simulate_environment と同じ結果を out に書き込む。
+    静的な物体（壁・床）は事前計算済みの範囲マスクと距離テーブルを参照する。
+    """
+    obstacle_angle = (90 + t * 20) % 360
+    moving_angle = (180 + math.sin(t) * 60) % 360
+    moving_distance = 4.0 + 1.0 * math.cos(t * 2)
+
+    for i in range(angles.size):
+        angle = angles[i]
+
+        # 物体1: 静止した壁（半円）
+        if wall_mask[i]:
+            out[i] = wall_env[i]
+            continue
+
+        # 物体2: 回転する障害物
+        angle_diff = abs(angle - obstacle_angle)
+        if angle_diff > 180:
+            angle_diff = 360 - angle_diff
+        if angle_diff < 20:
+            out[i] = 2.0 + 1.5 * (angle_diff / 20.0)
+            continue
+
+        # 物体3: 移動する物体
+        angle_diff = abs(angle - moving_angle)
+        if angle_diff > 180:
+            angle_diff = 360 - angle_diff
+        if angle_diff < 15:
+            out[i] = moving_distance
+            continue
+
+        # 物体4: 床（下方向）
+        if floor_mask[i]:
+            out[i] = floor_env[i]
+            continue
+
+        # その他: 検出なし
+        out[i] = 0.0
+
+    return out
+
+
+if njit is not None:
+    _simulate_environment_kernel = njit(cache=True, fastmath=True)(_simulate_environment_kernel)
 
 
 class DemoLidarGenerator:
@@ -37,78 +93,76 @@ class DemoLidarGenerator:
     def __init__(self):
         self.frame = 0
         self.scan_frequency = 6.0
+        self.num_points = 400
 
-    def generate_scan(self) -> LaserScan:
-        """デモスキャンデータを生成"""
-        points = []
+        # 360度をカバーする角度グリッド（全スキャンで共有するため読み取り専用にする）
+        self._angles = np.linspace(0.0, 360.0, self.num_points, endpoint=False, dtype=np.float32)
+        self._angles.flags.writeable = False
 
-        # 360度をカバーする測定点を生成
-        num_points = 400
-        for i in range(num_points):
-            angle = (i * 360.0 / num_points) % 360.0
-
-            # 複数の物体をシミュレート
-            distance = self._simulate_environment(angle, self.frame)
+        # 角度のみに依存する静的な物体の範囲マスクと距離テーブル
+        # （フレーム間で不変なので生成時に一度だけ計算）
+        # 物体1: 静止した壁（半円）
+        self._wall_mask = (self._angles >= 30) & (self._angles <= 150)
+        self._wall_env = (3.0 + 0.5 * np.sin(np.radians(self._angles * 3))).astype(np.float32)
+        # 物体4: 床（下方向）
+        self._floor_mask = (self._angles >= 200) & (self._angles <= 340)
+        self._floor_env = (1.5 + 0.3 * np.sin(np.radians(self._angles * 2))).astype(np.float32)
 
-            # 距離に基づいて強度を計算（近いほど強い）
-            if distance > 0:
-                intensity = int(255 * (1.0 - min(distance / 10.0, 1.0)))
-            else:
-                intensity = 0
+    def generate_scan(self) -> LaserScan:
+        """デモスキャンデータを生成"""
+        angles = self._angles
+
+        # 複数の物体をシミュレート
+        # （LaserScanは配列をコピーせずに保持するため、出力はフレームごとに確保する）
+        if njit is not None:
+            distances = _simulate_environment_kernel(angles, self._wall_mask, self._wall_env,
+                                                     self._floor_mask, self._floor_env,
+                                                     self.frame * 0.05, np.empty(self.num_points, dtype=np.float32))
+        else:
+            distances = self._simulate_environment(self.frame)
 
-            points.append(LaserPoint(
-                angle=angle,
-                distance=distance,
-                intensity=intensity
-            ))
+        # 距離に基づいて強度を計算（近いほど強い）
+        intensities = np.where(distances > 0, np.clip(255.0 * (1.0 - distances / 10.0), 0, 255), 0).astype(np.uint8)
 
         self.frame += 1
 
         return LaserScan(
-            points=points,
+            angles_deg=angles,
+            distances_m=distances,
+            intensities=intensities,
             scan_frequency=self.scan_frequency,
-            timestamp=time.time()
+            timestamp=time.monotonic()
         )
 
-    def _simulate_environment(self, angle: float, frame: int) -> float:
-        """環境をシミュレート（複数の物体）"""
+    def _simulate_environment(self, frame: int) -> np.ndarray:
+        """環境をシミュレート（複数の物体、角度配列に対してベクトル演算）"""
+        angles = self._angles
 
         # アニメーション用の時間変数
         t = frame * 0.05
 
-        # 物体1: 静止した壁（半円）
-        if 30 <= angle <= 150:
-            wall_distance = 3.0 + 0.5 * math.sin(math.radians(angle * 3))
-            return wall_distance
-
         # 物体2: 回転する障害物
         obstacle_angle = (90 + t * 20) % 360
-        angle_diff = abs(angle - obstacle_angle)
-        if angle_diff > 180:
-            angle_diff = 360 - angle_diff
-
-        if angle_diff < 20:
-            # 角度差に応じて距離を変化
-            obstacle_distance = 2.0 + 1.5 * (angle_diff / 20.0)
-            return obstacle_distance
+        obstacle_diff = np.abs(angles - obstacle_angle)
+        obstacle_diff = np.where(obstacle_diff > 180, 360 - obstacle_diff, obstacle_diff)
+        obstacle_mask = obstacle_diff < 20
 
         # 物体3: 移動する物体
         moving_angle = (180 + math.sin(t) * 60) % 360
-        angle_diff = abs(angle - moving_angle)
-        if angle_diff > 180:
-            angle_diff = 360 - angle_diff
-
-        if angle_diff < 15:
-            moving_distance = 4.0 + 1.0 * math.cos(t * 2)
-            return moving_distance
-
-        # 物体4: 床（下方向）
-        if 200 <= angle <= 340:
-            floor_distance = 1.5 + 0.3 * math.sin(math.radians(angle * 2))
-            return floor_distance
+        moving_diff = np.abs(angles - moving_angle)
+        moving_diff = np.where(moving_diff > 180, 360 - moving_diff, moving_diff)
+        moving_mask = moving_diff < 15
 
+        # 優先度の低い物体から順に書き込み、手前の物体で上書きする
         # その他: 検出なし
-        return 0.0
+        distances = np.zeros(self.num_points, dtype=np.float32)
+        distances[self._floor_mask] = self._floor_env[self._floor_mask]
+        distances[moving_mask] = 4.0 + 1.0 * math.cos(t * 2)
+        # 角度差に応じて距離を変化
+        distances[obstacle_mask] = 2.0 + 1.5 * (obstacle_diff[obstacle_mask] / 20.0)
+        distances[self._wall_mask] = self._wall_env[self._wall_mask]
+
+        return distances
 
 
 class LidarVisualizer:
@@ -126,6 +180,7 @@ class LidarVisualizer:
         self.max_range = max_range
         self.initial_max_range = max_range  # 初期値を保存
         self.latest_scan = None
+        self._dirty = False  # 前回の描画以降にスキャンや表示範囲が変わったか
 
         if demo_mode:
             self.demo_generator = DemoLidarGenerator()
@@ -142,6 +197,11 @@ class LidarVisualizer:
         self.r_min = 0
         self.r_max = max_range
 
+        # 描画対象マスク・描画座標の作業用バッファ（スキャンの点数に合わせて拡張して使い回す）
+        self._plot_mask = np.empty(0, dtype=bool)
+        self._range_mask = np.empty(0, dtype=bool)
+        self._offsets = np.empty((0, 2))
+
         self._setup_plot()
 
     def _setup_plot(self):
@@ -155,12 +215,17 @@ class LidarVisualizer:
         self.ax.grid(True, alpha=0.3)
 
         # 初期プロット（空）
-        self.scatter = self.ax.scatter([], [], c=[], s=10, cmap='jet', alpha=0.8)
-
-        # 統計情報テキスト
-        self.stats_text = self.fig.text(0.02, 0.98, '', transform=self.fig.transFigure,
-                                        verticalalignment='top', fontsize=10,
-                                        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+        # 縁取り線は描かず（点ごとのエッジパス計算を省略）、その分マーカーを大きめにする。
+        # カラーマップの範囲は作成時に固定しておく
+        self.scatter = self.ax.scatter([], [], c=[], s=20, cmap='jet', alpha=0.8, linewidths=0,
+                                       vmin=0, vmax=self.max_range)
+
+        # 統計情報テキスト（blitで更新できるよう専用の非表示Axesに配置）
+        self.stats_ax = self.fig.add_axes([0.02, 0.78, 0.3, 0.2])
+        self.stats_ax.set_axis_off()
+        self.stats_text = self.stats_ax.text(0.0, 1.0, '', transform=self.stats_ax.transAxes,
+                                             verticalalignment='top', fontsize=10, animated=True,
+                                             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
         # ヘルプテキスト
         help_str = "マウス操作:\n"
@@ -184,67 +249,107 @@ class LidarVisualizer:
     def update_scan(self, scan: LaserScan):
         """スキャンデータを更新"""
         self.latest_scan = scan
+        self._dirty = True
 
     def _update_plot(self, frame):
         """プロット更新（アニメーション用）"""
 
         # デモモードの場合、データを生成
         if self.demo_mode:
-            self.latest_scan = self.demo_generator.generate_scan()
+            self.update_scan(self.demo_generator.generate_scan())
             self.scan_count += 1
 
-        if self.latest_scan is None:
-            return self.scatter,
-
-        # 有効なポイントのみ抽出
-        points = self.latest_scan.get_valid_points()
-
-        if len(points) == 0:
-            return self.scatter,
-
-        # データ抽出
-        angles = np.array([np.radians(p.angle) for p in points])
-        distances = np.array([p.distance for p in points])
-
-        # 距離範囲でフィルタ（現在の表示範囲を使用）
-        valid_mask = (distances >= self.r_min) & (distances <= self.r_max)
-        angles = angles[valid_mask]
-        distances = distances[valid_mask]
-
-        # プロット更新
-        self.scatter.set_offsets(np.c_[angles, distances])
-        self.scatter.set_array(distances)
-        self.scatter.set_clim(0, self.r_max)
+        # 前回の描画から変化が無ければ再計算しない（センサーより描画周期が速い場合）
+        if not self._dirty or self.latest_scan is None:
+            return self.scatter, self.stats_text
+        self._dirty = False
+
+        # 有効なポイントが無ければ配列を作らずに終了
+        scan = self.latest_scan
+        if scan.n_valid == 0:
+            return self.scatter, self.stats_text
+
+        # 有効かつ表示範囲内の点のマスクを作業用バッファ上で計算（現在の表示範囲を使用）
+        n = len(scan)
+        if self._plot_mask.size < n:
+            self._plot_mask = np.empty(n, dtype=bool)
+            self._range_mask = np.empty(n, dtype=bool)
+        plot_mask = self._plot_mask[:n]
+        range_mask = self._range_mask[:n]
+        np.greater_equal(scan.distances_m, self.r_min, out=plot_mask)
+        np.less_equal(scan.distances_m, self.r_max, out=range_mask)
+        np.logical_and(plot_mask, range_mask, out=plot_mask)
+        np.logical_and(plot_mask, scan.valid_mask, out=plot_mask)
+
+        plot_angles = scan.angles_rad[plot_mask]
+        plot_distances = scan.distances_m[plot_mask]
+
+        # 描画点数が極座標の円周ピクセル数を超える場合は間引く
+        # （画面上で区別できない点を描いても描画時間が増えるだけのため）
+        point_budget = int(np.pi * self.ax.bbox.width)
+        if len(plot_distances) > point_budget:
+            step = -(-len(plot_distances) // point_budget)
+            plot_angles = plot_angles[::step]
+            plot_distances = plot_distances[::step]
+
+        # プロット更新（座標は作業用バッファに書き込んで渡す）
+        n_plot = len(plot_distances)
+        if len(self._offsets) < n_plot:
+            self._offsets = np.empty((n_plot, 2))
+        offsets = self._offsets[:n_plot]
+        offsets[:, 0] = plot_angles
+        offsets[:, 1] = plot_distances
+        self.scatter.set_offsets(offsets)
+        self.scatter.set_array(plot_distances)
 
         # 統計情報更新
-        stats = self._calculate_stats(points)
+        stats = self._calculate_stats(scan)
         self.stats_text.set_text(stats)
 
-        return self.scatter,
+        return self.scatter, self.stats_text
+
+    def _calculate_stats(self, scan: LaserScan):
+        """
+        統計情報を計算
 
-    def _calculate_stats(self, points):
-        """統計情報を計算"""
-        valid_points = [p for p in points if p.is_valid()]
+        有効なポイントを抽出した配列は作らず、valid_mask を where に指定して
+        スキャンの配列を直接集計する。
 
-        if len(valid_points) == 0:
+        Args:
+            scan: 表示中のスキャン
+        """
+        n_valid = scan.n_valid
+        if n_valid == 0:
             return "データなし"
 
-        distances = [p.distance for p in valid_points]
-        intensities = [p.intensity for p in valid_points]
+        valid_mask = scan.valid_mask
+        distances = scan.distances_m
+        intensities = scan.intensities
+        intensity_max = intensities.max(where=valid_mask, initial=0)
 
         scan_count = self.scan_count if self.demo_mode else self.driver.get_scan_count()
 
         stats = f"{'[デモモード]' if self.demo_mode else '[実データ]'}\n"
         stats += f"スキャン数: {scan_count}\n"
-        stats += f"測定点数: {len(valid_points)}\n"
-        stats += f"周波数: {self.latest_scan.scan_frequency:.1f} Hz\n"
-        stats += f"距離: {min(distances):.2f} - {max(distances):.2f} m\n"
-        stats += f"平均距離: {np.mean(distances):.2f} m\n"
-        if intensities and max(intensities) > 0:
-            stats += f"強度: {min(intensities)} - {max(intensities)}"
+        stats += f"測定点数: {n_valid}\n"
+        stats += f"周波数: {scan.scan_frequency:.1f} Hz\n"
+        stats += f"距離: {distances.min(where=valid_mask, initial=np.inf):.2f} - " \
+                 f"{distances.max(where=valid_mask, initial=0.0):.2f} m\n"
+        stats += f"平均距離: {distances.sum(where=valid_mask) / n_valid:.2f} m\n"
+        if intensity_max > 0:
+            stats += f"強度: {intensities.min(where=valid_mask, initial=intensity_max)} - {intensity_max}"
 
         return stats
 
+    def _redraw_background(self):
+        """
+        表示範囲の変更後に図全体を再描画
+
+        draw_idle() では先にアニメーションの次フレームが描画され、変更前の背景が
+        blit用にキャッシュされることがあるため、その場で描画する。
+        """
+        self.fig.canvas.draw()
+
     def _on_scroll(self, event):
         """マウスホイール/トラックパッドでズーム"""
         if event.inaxes != self.ax:
@@ -275,7 +380,9 @@ class LidarVisualizer:
         self.ax.set_ylim(new_r_min, new_r_max)
         self.r_min = new_r_min
         self.r_max = new_r_max
-        self.fig.canvas.draw_idle()
+        self.scatter.set_clim(0, self.r_max)
+        self._dirty = True
+        self._redraw_background()
 
     def _on_button_press(self, event):
         """マウスボタン押下"""
@@ -287,7 +394,9 @@ class LidarVisualizer:
             self.ax.set_ylim(0, self.initial_max_range)
             self.r_min = 0
             self.r_max = self.initial_max_range
-            self.fig.canvas.draw_idle()
+            self.scatter.set_clim(0, self.r_max)
+            self._dirty = True
+            self._redraw_background()
 
         # 右クリック: パン開始
         elif event.button == 3:
@@ -330,10 +439,12 @@ class LidarVisualizer:
         self.ax.set_ylim(new_r_min, new_r_max)
         self.r_min = new_r_min
         self.r_max = new_r_max
+        self.scatter.set_clim(0, self.r_max)
+        self._dirty = True
 
         # パン開始位置を更新
         self.pan_start = (event.xdata, event.ydata)
-        self.fig.canvas.draw_idle()
+        self._redraw_background()
 
     def start(self, interval=50):
         """
@@ -346,8 +457,9 @@ class LidarVisualizer:
         if not self.demo_mode and self.driver:
             self.driver.start_scanning(callback=self.update_scan)
 
-        # アニメーション開始（blit=Falseでマウス操作時の再描画を有効化）
-        ani = FuncAnimation(self.fig, self._update_plot, interval=interval, blit=False)
+        # アニメーション開始（blit=Trueで点群と統計情報のみ再描画、
+        # ズーム・パン時はマウスイベント側で全体を再描画）
+        self._animation = FuncAnimation(self.fig, self._update_plot, interval=interval, blit=True)
 
         mode_str = "デモモード" if self.demo_mode else "実センサーモード"
         print(f"{mode_str}で可視化開始。ウィンドウを閉じると終了します。")
@@ -10,6 +10,7 @@ import sys
 import os
 import argparse
 import time
+import numpy as np
 
 # ライブラリのパスを追加（開発時用）
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -37,7 +38,7 @@ def main():
             driver.start_scanning()
             print(f"\nスキャン開始... ({args.scans} スキャン取得)")
 
-            csv_data = []
+            csv_chunks = []
 
             for i in range(args.scans):
                 # スキャンデータ取得
@@ -47,46 +48,47 @@ def main():
                     print(f"  スキャン {i+1}: タイムアウト")
                     continue
 
-                # 有効なポイント数
-                valid_points = scan.get_valid_points()
+                # 有効なポイント
+                valid_mask = scan.valid_mask
+                angles = scan.angles_deg[valid_mask]
+                distances = scan.distances_m[valid_mask]
+                intensities = scan.intensities[valid_mask]
+                num_valid = len(distances)
 
                 print(f"  スキャン {i+1}/{args.scans}:")
-                print(f"    測定点数: {len(scan.points)} (有効: {len(valid_points)})")
+                print(f"    測定点数: {len(scan)} (有効: {num_valid})")
                 print(f"    周波数: {scan.scan_frequency:.1f} Hz")
 
-                if len(valid_points) > 0:
-                    distances = [p.distance for p in valid_points]
-                    print(f"    距離範囲: {min(distances):.3f} - {max(distances):.3f} m")
+                if num_valid > 0:
+                    print(f"    距離範囲: {distances.min():.3f} - {distances.max():.3f} m")
 
                     # 最初のスキャンの詳細を表示
                     if i == 0:
                         print(f"\n  最初の10点のデータ:")
-                        for j, point in enumerate(valid_points[:10]):
-                            print(f"    [{j}] 角度: {point.angle:6.2f}°, "
-                                  f"距離: {point.distance:.3f} m, "
-                                  f"強度: {point.intensity}")
+                        for j in range(min(10, num_valid)):
+                            print(f"    [{j}] 角度: {angles[j]:6.2f}°, "
+                                  f"距離: {distances[j]:.3f} m, "
+                                  f"強度: {intensities[j]}")
 
-                    # CSV保存用データ
+                    # CSV保存用データ（スキャン単位の配列として蓄積）
                     if args.save:
-                        for point in valid_points:
-                            csv_data.append([
-                                i + 1,
-                                point.angle,
-                                point.distance,
-                                point.intensity,
-                                scan.timestamp
-                            ])
+                        csv_chunks.append(np.column_stack([
+                            np.full(num_valid, i + 1),
+                            angles,
+                            distances,
+                            intensities,
+                            np.full(num_valid, scan.timestamp)
+                        ]))
 
                 time.sleep(0.1)
 
             # CSV保存
-            if args.save and csv_data:
+            if args.save and csv_chunks:
                 print(f"\nデータをCSVファイルに保存中: {args.save}")
-                import csv
-                with open(args.save, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Scan', 'Angle(deg)', 'Distance(m)', 'Intensity', 'Timestamp'])
-                    writer.writerows(csv_data)
+                csv_data = np.concatenate(csv_chunks)
+                np.savetxt(args.save, csv_data, delimiter=',',
+                           fmt=['%d', '%.6f', '%.6f', '%d', '%.6f'],
+                           header='Scan,Angle(deg),Distance(m),Intensity,Timestamp', comments='')
                 print(f"保存完了: {len(csv_data)} 行")
 
             print(f"\n完了！ 合計スキャン数: {driver.get_scan_count()}")
@@ -39,6 +39,7 @@ class LidarVisualizer:
         self.max_range = max_range
         self.initial_max_range = max_range  # 初期値を保存
         self.latest_scan = None
+        self._dirty = False  # 前回の描画以降にスキャンや表示範囲が変わったか
 
         # グラフ設定
         self.fig, self.ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
@@ -53,6 +54,11 @@ class LidarVisualizer:
         self.r_min = 0
         self.r_max = max_range
 
+        # 描画対象マスク・描画座標の作業用バッファ（スキャンの点数に合わせて拡張して使い回す）
+        self._plot_mask = np.empty(0, dtype=bool)
+        self._range_mask = np.empty(0, dtype=bool)
+        self._offsets = np.empty((0, 2))
+
         self._setup_plot()
 
     def _setup_plot(self):
@@ -64,12 +70,17 @@ class LidarVisualizer:
         self.ax.grid(True, alpha=0.3)
 
         # 初期プロット（空）
-        self.scatter = self.ax.scatter([], [], c=[], s=10, cmap='jet', alpha=0.8)
-
-        # 統計情報テキスト
-        self.stats_text = self.fig.text(0.02, 0.98, '', transform=self.fig.transFigure,
-                                        verticalalignment='top', fontsize=10,
-                                        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+        # 縁取り線は描かず（点ごとのエッジパス計算を省略）、その分マーカーを大きめにする。
+        # カラーマップの範囲は作成時に固定しておく
+        self.scatter = self.ax.scatter([], [], c=[], s=20, cmap='jet', alpha=0.8, linewidths=0,
+                                       vmin=0, vmax=self.max_range)
+
+        # 統計情報テキスト（blitで更新できるよう専用の非表示Axesに配置）
+        self.stats_ax = self.fig.add_axes([0.02, 0.78, 0.3, 0.2])
+        self.stats_ax.set_axis_off()
+        self.stats_text = self.stats_ax.text(0.0, 1.0, '', transform=self.stats_ax.transAxes,
+                                             verticalalignment='top', fontsize=10, animated=True,
+                                             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
 
         # ヘルプテキスト
         help_str = "マウス操作:\n"
@@ -93,60 +104,98 @@ class LidarVisualizer:
     def update_scan(self, scan: LaserScan):
         """スキャンデータを更新"""
         self.latest_scan = scan
+        self._dirty = True
 
     def _update_plot(self, frame):
         """プロット更新（アニメーション用）"""
-        if self.latest_scan is None:
-            return self.scatter,
-
-        # 有効なポイントのみ抽出
-        points = self.latest_scan.get_valid_points()
-
-        if len(points) == 0:
-            return self.scatter,
-
-        # データ抽出
-        angles = np.array([np.radians(p.angle) for p in points])
-        distances = np.array([p.distance for p in points])
-        intensities = np.array([p.intensity for p in points])
-
-        # 距離範囲でフィルタ（現在の表示範囲を使用）
-        valid_mask = (distances >= self.r_min) & (distances <= self.r_max)
-        angles = angles[valid_mask]
-        distances = distances[valid_mask]
-        intensities = intensities[valid_mask]
-
-        # プロット更新
-        self.scatter.set_offsets(np.c_[angles, distances])
-        self.scatter.set_array(distances)
-        self.scatter.set_clim(0, self.r_max)
+        # 前回の描画から変化が無ければ再計算しない（センサーより描画周期が速い場合）
+        if not self._dirty or self.latest_scan is None:
+            return self.scatter, self.stats_text
+        self._dirty = False
+
+        # 有効なポイントが無ければ配列を作らずに終了
+        scan = self.latest_scan
+        if scan.n_valid == 0:
+            return self.scatter, self.stats_text
+
+        # 有効かつ表示範囲内の点のマスクを作業用バッファ上で計算（現在の表示範囲を使用）
+        n = len(scan)
+        if self._plot_mask.size < n:
+            self._plot_mask = np.empty(n, dtype=bool)
+            self._range_mask = np.empty(n, dtype=bool)
+        plot_mask = self._plot_mask[:n]
+        range_mask = self._range_mask[:n]
+        np.greater_equal(scan.distances_m, self.r_min, out=plot_mask)
+        np.less_equal(scan.distances_m, self.r_max, out=range_mask)
+        np.logical_and(plot_mask, range_mask, out=plot_mask)
+        np.logical_and(plot_mask, scan.valid_mask, out=plot_mask)
+
+        plot_angles = scan.angles_rad[plot_mask]
+        plot_distances = scan.distances_m[plot_mask]
+
+        # 描画点数が極座標の円周ピクセル数を超える場合は間引く
+        # （画面上で区別できない点を描いても描画時間が増えるだけのため）
+        point_budget = int(np.pi * self.ax.bbox.width)
+        if len(plot_distances) > point_budget:
+            step = -(-len(plot_distances) // point_budget)
+            plot_angles = plot_angles[::step]
+            plot_distances = plot_distances[::step]
+
+        # プロット更新（座標は作業用バッファに書き込んで渡す）
+        n_plot = len(plot_distances)
+        if len(self._offsets) < n_plot:
+            self._offsets = np.empty((n_plot, 2))
+        offsets = self._offsets[:n_plot]
+        offsets[:, 0] = plot_angles
+        offsets[:, 1] = plot_distances
+        self.scatter.set_offsets(offsets)
+        self.scatter.set_array(plot_distances)
 
         # 統計情報更新
-        stats = self._calculate_stats(points)
+        stats = self._calculate_stats(scan)
         self.stats_text.set_text(stats)
 
-        return self.scatter,
+        return self.scatter, self.stats_text
+
+    def _calculate_stats(self, scan: LaserScan):
+        """
+        統計情報を計算
 
-    def _calculate_stats(self, points):
-        """統計情報を計算"""
-        valid_points = [p for p in points if p.is_valid()]
+        有効なポイントを抽出した配列は作らず、valid_mask を where に指定して
+        スキャンの配列を直接集計する。
 
-        if len(valid_points) == 0:
+        Args:
+            scan: 表示中のスキャン
+        """
+        n_valid = scan.n_valid
+        if n_valid == 0:
             return "データなし"
 
-        distances = [p.distance for p in valid_points]
-        intensities = [p.intensity for p in valid_points]
+        valid_mask = scan.valid_mask
+        distances = scan.distances_m
+        intensities = scan.intensities
+        intensity_max = intensities.max(where=valid_mask, initial=0)
 
         stats = f"スキャン数: {self.driver.get_scan_count()}\n"
-        stats += f"測定点数: {len(valid_points)}\n"
-        stats += f"周波数: {self.latest_scan.scan_frequency:.1f} Hz\n"
-        stats += f"距離: {min(distances):.2f} - {max(distances):.2f} m\n"
-        stats += f"平均距離: {np.mean(distances):.2f} m\n"
-        if intensities and max(intensities) > 0:
-            stats += f"強度: {min(intensities)} - {max(intensities)}"
+        stats += f"測定点数: {n_valid}\n"
+        stats += f"周波数: {scan.scan_frequency:.1f} Hz\n"
+        stats += f"距離: {distances.min(where=valid_mask, initial=np.inf):.2f} - " \
+                 f"{distances.max(where=valid_mask, initial=0.0):.2f} m\n"
+        stats += f"平均距離: {distances.sum(where=valid_mask) / n_valid:.2f} m\n"
+        if intensity_max > 0:
+            stats += f"強度: {intensities.min(where=valid_mask, initial=intensity_max)} - {intensity_max}"
 
         return stats
 
+    def _redraw_background(self):
+        """
+        表示範囲の変更後に図全体を再描画
+
+        draw_idle() では先にアニメーションの次フレームが描画され、変更前の背景が
+        blit用にキャッシュされることがあるため、その場で描画する。
+        """
+        self.fig.canvas.draw()
+
     def _on_scroll(self, event):
         """マウスホイール/トラックパッドでズーム"""
         if event.inaxes != self.ax:
@@ -177,7 +226,9 @@ class LidarVisualizer:
         self.ax.set_ylim(new_r_min, new_r_max)
         self.r_min = new_r_min
         self.r_max = new_r_max
-        self.fig.canvas.draw_idle()
+        self.scatter.set_clim(0, self.r_max)
+        self._dirty = True
+        self._redraw_background()
 
     def _on_button_press(self, event):
         """マウスボタン押下"""
@@ -189,7 +240,9 @@ class LidarVisualizer:
             self.ax.set_ylim(0, self.initial_max_range)
             self.r_min = 0
             self.r_max = self.initial_max_range
-            self.fig.canvas.draw_idle()
+            self.scatter.set_clim(0, self.r_max)
+            self._dirty = True
+            self._redraw_background()
 
         # 右クリック: パン開始
         elif event.button == 3:
@@ -232,10 +285,12 @@ class LidarVisualizer:
         self.ax.set_ylim(new_r_min, new_r_max)
         self.r_min = new_r_min
         self.r_max = new_r_max
+        self.scatter.set_clim(0, self.r_max)
+        self._dirty = True
 
         # パン開始位置を更新
         self.pan_start = (event.xdata, event.ydata)
-        self.fig.canvas.draw_idle()
+        self._redraw_background()
 
     def start(self, interval: int = 50):
         """
@@ -247,8 +302,9 @@ class LidarVisualizer:
         # スキャン開始
         self.driver.start_scanning(callback=self.update_scan)
 
-        # アニメーション開始（blit=Falseでマウス操作時の再描画を有効化）
-        ani = FuncAnimation(self.fig, self._update_plot, interval=interval, blit=False)
+        # アニメーション開始（blit=Trueで点群と統計情報のみ再描画、
+        # ズーム・パン時はマウスイベント側で全体を再描画）
+        self._animation = FuncAnimation(self.fig, self._update_plot, interval=interval, blit=True)
 
         print("可視化開始。ウィンドウを閉じると終了します。")
         plt.show()
@@ -23,14 +23,17 @@ setup(
         "Intended Audience :: Developers",
         "Topic :: System :: Hardware :: Hardware Drivers",
     ],
-    python_requires=">=3.7",
+    python_requires=">=3.8",
     install_requires=[
         "pyserial>=3.5",
+        "numpy>=1.20.0",
     ],
     extras_require={
         "visualization": [
-            "numpy>=1.20.0",
             "matplotlib>=3.3.0",
         ],
+        "fast": [
+            "numba>=0.53.0",
+        ],
     },
 )
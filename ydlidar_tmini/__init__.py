@@ -8,7 +8,7 @@ YDLiDAR T-mini Pro Mac用ドライバーライブラリ
         lidar.start_scanning()
         scan = lidar.get_scan(timeout=2.0)
         if scan:
-            for point in scan.get_valid_points():
+            for point in scan.iter_valid_points():
                 print(f"Angle: {point.angle:.2f}, Distance: {point.distance:.3f}m")
 """
 
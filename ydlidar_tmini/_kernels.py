@@ -0,0 +1,135 @@
+"""
+パケットデコード用の数値カーネル
+
+numbaがインストールされている場合はJITコンパイルして使用する。
+未インストールの場合 decode_packet_* は None となり、protocol側のNumPy版が使われる。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numbaが無い場合はNumPy版のデコードを使用
+    njit = None
+
+
+# プロトコル定数（YDLidarProtocol と同じ値）
+_HEADER_SIZE = 10
+_MAX_POINTS_PER_PACKET = 80
+
+
+def _decode_packet(buf, has_intensity, intensity_bit):
+    """
+    ヘッダー解析・チェックサム計算・測定点デコードを1パスで行う
+
+    YDLidarProtocol のヘッダー解析・チェックサム検証・測定点パースと同じ結果を返す。
+    出力配列はスキャンがそのまま保持するため、パケットごとに lsn 点分を確保する。
+
+    強度モードごとの decode_packet_* から定数引数でインライン展開して使うため、
+    モード判定の分岐はコンパイル時に取り除かれる。
+
+    Args:
+        buf: パケットデータ（ヘッダー含む）のuint8配列
+        has_intensity: 強度データを含むか
+        intensity_bit: 強度データのビット数 (8 or 10)
+
+    Returns:
+        (CT, 角度[度], 距離[m], 強度) のタプル
+        パケットが不正な場合は CT = -1（配列は空）
+    """
+    bytes_per_point = 3 if has_intensity else 2
+
+    # ヘッダーチェック
+    lsn = 0
+    if buf.size >= _HEADER_SIZE and buf[0] == 0xAA and buf[1] == 0x55:
+        lsn = int(buf[3])
+
+    # サンプル点数とデータ部サイズの妥当性チェック
+    if lsn < 1 or lsn > _MAX_POINTS_PER_PACKET or buf.size < _HEADER_SIZE + lsn * bytes_per_point:
+        return (-1, np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32),
+                np.empty(0, dtype=np.uint16))
+
+    # フィールド解析（リトルエンディアン）
+    ct = int(buf[2])
+    fsa = int(buf[4]) | (int(buf[5]) << 8)
+    lsa = int(buf[6]) | (int(buf[7]) << 8)
+    expected_cs = int(buf[8]) | (int(buf[9]) << 8)
+
+    # 角度の計算（度単位）
+    angle_fsa = (fsa >> 1) / 64.0
+    angle_lsa = (lsa >> 1) / 64.0
+    angle_diff = angle_lsa - angle_fsa
+    if angle_diff < 0:
+        angle_diff += 360.0
+    angle_step = angle_diff / (lsn - 1) if lsn > 1 else 0.0
+
+    angles = np.empty(lsn, dtype=np.float32)
+    distances = np.empty(lsn, dtype=np.float32)
+    intensities = np.empty(lsn, dtype=np.uint16)
+
+    # チェックサム: PH で初期化し、FSA・データ部・(CT + LSN)・LSA をXOR
+    cs = 0x55AA ^ fsa
+
+    i = _HEADER_SIZE
+    for n in range(lsn):
+        if has_intensity:
+            s0 = int(buf[i])
+            s1 = int(buf[i + 1])
+            s2 = int(buf[i + 2])
+            word = (s2 << 8) | s1
+            cs ^= s0 ^ word
+            # 距離抽出（上位14bit）
+            raw_distance = word & 0xFFFC
+            if intensity_bit == 10:
+                intensities[n] = ((s1 & 0x03) << 8) | s0
+            else:
+                intensities[n] = s0
+        else:
+            word = int(buf[i]) | (int(buf[i + 1]) << 8)
+            cs ^= word
+            raw_distance = word
+            intensities[n] = 0
+
+        # 生データ(1/4 mm単位) → m に変換
+        distances[n] = raw_distance * (0.25 / 1000.0)
+
+        # 各点の角度（線形補間）を0-360度の範囲に正規化
+        angles[n] = (angle_fsa + n * angle_step) % 360.0
+
+        i += bytes_per_point
+
+    cs ^= ct | (lsn << 8)
+    cs ^= lsa
+
+    if cs != expected_cs:
+        return (-1, np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32),
+                np.empty(0, dtype=np.uint16))
+
+    return ct, angles, distances, intensities
+
+
+def decode_packet_intensity8(buf):
+    """8ビット強度ありのパケットをデコード"""
+    return _decode_packet(buf, True, 8)
+
+
+def decode_packet_intensity10(buf):
+    """10ビット強度ありのパケットをデコード"""
+    return _decode_packet(buf, True, 10)
+
+
+def decode_packet_no_intensity(buf):
+    """強度なしのパケットをデコード"""
+    return _decode_packet(buf, False, 8)
+
+
+if njit is not None:
+    _decode_packet = njit(inline='always', boundscheck=False)(_decode_packet)
+    decode_packet_intensity8 = njit(cache=True, boundscheck=False)(decode_packet_intensity8)
+    decode_packet_intensity10 = njit(cache=True, boundscheck=False)(decode_packet_intensity10)
+    decode_packet_no_intensity = njit(cache=True, boundscheck=False)(decode_packet_no_intensity)
+else:
+    decode_packet_intensity8 = None
+    decode_packet_intensity10 = None
+    decode_packet_no_intensity = None
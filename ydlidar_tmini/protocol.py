@@ -3,9 +3,14 @@ YDLiDAR T-mini Pro 通信プロトコル実装
 """
 
 import struct
-from typing import Optional, Tuple, List
-from .types import LaserPoint, LaserScan
-import time
+from typing import Dict, Optional, Tuple
+import numpy as np
+from .types import LaserScan
+from ._kernels import decode_packet_intensity8, decode_packet_intensity10, decode_packet_no_intensity
+
+
+# ヘッダー（PH, CT, LSN, FSA, LSA, CS）のフォーマット（リトルエンディアン、事前コンパイル）
+_HEADER_STRUCT = struct.Struct('<HBBHHH')
 
 
 class YDLidarProtocol:
@@ -29,6 +34,29 @@ class YDLidarProtocol:
         self.intensity_bit = intensity_bit
         self.bytes_per_point = 3 if has_intensity else 2
 
+        # 角度の線形補間係数（0〜1）のテーブル（サンプル点数ごとにキャッシュ）
+        self._lerp_cache: Dict[int, np.ndarray] = {}
+
+        # 強度モードごとに分岐を取り除いたデコード処理を選択しておく
+        # （_decode_kernel はnumbaが無い場合None）
+        if has_intensity:
+            self._verify_checksum = self._verify_checksum_intensity
+            if intensity_bit == 10:
+                self._parse_points = self._parse_points_intensity10
+                self._decode_kernel = decode_packet_intensity10
+            else:
+                self._parse_points = self._parse_points_intensity8
+                self._decode_kernel = decode_packet_intensity8
+        else:
+            self._verify_checksum = self._verify_checksum_no_intensity
+            self._parse_points = self._parse_points_no_intensity
+            self._decode_kernel = decode_packet_no_intensity
+
+        # JITコンパイルをここで済ませておく（初回呼び出し時のコンパイルは1秒近くかかることがあり、
+        # スキャンスレッド内で行うとその間に受信データが溜まり最初のスキャンを取りこぼすため）
+        if self._decode_kernel is not None:
+            self._decode_kernel(self._as_kernel_input(bytes(self.HEADER_SIZE)))
+
     def parse_packet(self, data: bytes) -> Optional[Tuple[LaserScan, bool]]:
         """
         データパケットをパースする
@@ -40,6 +68,54 @@ class YDLidarProtocol:
             (LaserScan, is_new_scan) のタプル、またはNone
             is_new_scan: 新しいスキャン（零位包）の場合True
         """
+        if self._decode_kernel is not None:
+            # numbaがある場合はJITコンパイル済みカーネルで一括デコード
+            ct, angles, distances, intensities = self._decode_kernel(self._as_kernel_input(data))
+            if ct < 0:
+                return None
+        else:
+            decoded = self._decode_packet(data)
+            if decoded is None:
+                return None
+            ct, angles, distances, intensities = decoded
+
+        # スキャン周波数計算（0.1Hz単位）
+        scan_frequency = (ct >> 1) * 0.1
+
+        # 零位包（新しいスキャン）かどうか
+        is_new_scan = bool(ct & self.CT_ZERO_POSITION_FLAG)
+
+        # LaserScanオブジェクト作成
+        # （タイムスタンプはスキャン完成時にドライバー側で付けるため、パケット単位では取得しない）
+        scan = LaserScan(
+            angles_deg=angles,
+            distances_m=distances,
+            intensities=intensities,
+            scan_frequency=scan_frequency,
+            timestamp=0.0
+        )
+
+        return scan, is_new_scan
+
+    @staticmethod
+    def _as_kernel_input(data: bytes) -> np.ndarray:
+        """
+        パケットデータをカーネルに渡すuint8配列に変換（コピーなし）
+
+        bytes と bytearray のmemoryviewのどちらを渡しても同じ型（読み取り専用配列）にそろえ、
+        事前コンパイルした関数がそのまま使われるようにする。
+        """
+        buf = np.frombuffer(data, dtype=np.uint8)
+        buf.flags.writeable = False
+        return buf
+
+    def _decode_packet(self, data: bytes) -> Optional[Tuple]:
+        """
+        パケットをデコード（NumPy版）
+
+        Returns:
+            (CT, 角度, 距離, 強度) のタプル、またはNone
+        """
         if len(data) < self.HEADER_SIZE:
             return None
 
@@ -64,22 +140,9 @@ class YDLidarProtocol:
             return None
 
         # 測定点データをパース
-        points = self._parse_points(packet_data, lsn, fsa, lsa)
-
-        # スキャン周波数計算（0.1Hz単位）
-        scan_frequency = (ct >> 1) * 0.1
-
-        # 零位包（新しいスキャン）かどうか
-        is_new_scan = bool(ct & self.CT_ZERO_POSITION_FLAG)
+        angles, distances, intensities = self._parse_points(packet_data, lsn, fsa, lsa)
 
-        # LaserScanオブジェクト作成
-        scan = LaserScan(
-            points=points,
-            scan_frequency=scan_frequency,
-            timestamp=time.time()
-        )
-
-        return scan, is_new_scan
+        return ct, angles, distances, intensities
 
     def _parse_header(self, header_data: bytes) -> Optional[Tuple]:
         """
@@ -96,12 +159,8 @@ class YDLidarProtocol:
             return None
 
         # フィールド解析（リトルエンディアン）
-        ph = struct.unpack('<H', header_data[0:2])[0]   # 0x55AA
-        ct = header_data[2]                             # パケットタイプ
-        lsn = header_data[3]                            # サンプル点数
-        fsa = struct.unpack('<H', header_data[4:6])[0]  # 開始角度
-        lsa = struct.unpack('<H', header_data[6:8])[0]  # 終了角度
-        cs = struct.unpack('<H', header_data[8:10])[0]  # チェックサム
+        # PH: 0x55AA, CT: パケットタイプ, LSN: サンプル点数, FSA: 開始角度, LSA: 終了角度, CS: チェックサム
+        ph, ct, lsn, fsa, lsa, cs = _HEADER_STRUCT.unpack_from(header_data)
 
         # サンプル点数の妥当性チェック
         if lsn < 1 or lsn > self.MAX_POINTS_PER_PACKET:
@@ -109,9 +168,22 @@ class YDLidarProtocol:
 
         return ph, ct, lsn, fsa, lsa, cs
 
-    def _verify_checksum(self, packet_data: bytes, expected_cs: int) -> bool:
+    def _header_checksum(self, packet_data: bytes) -> int:
         """
-        チェックサムを検証（公式SDK準拠）
+        チェックサムのうちヘッダー部分を計算（公式SDK準拠）
+
+        Args:
+            packet_data: ヘッダー+データ部（チェックサム含む）
+
+        Returns:
+            PH (0x55AA) で初期化し、FSA・(CT + LSN)・LSA をワードとしてXORした値
+        """
+        ph, ct, lsn, fsa, lsa, cs = _HEADER_STRUCT.unpack_from(packet_data)
+        return 0x55AA ^ fsa ^ (ct | (lsn << 8)) ^ lsa
+
+    def _verify_checksum_intensity(self, packet_data: bytes, expected_cs: int) -> bool:
+        """
+        チェックサムを検証（強度あり: 3バイト/点）
 
         Args:
             packet_data: ヘッダー+データ部（チェックサム含む）
@@ -120,61 +192,52 @@ class YDLidarProtocol:
         Returns:
             チェックサムが正しければTrue
         """
-        # 公式SDKと同じチェックサム計算方法
-        # 1. PH (0x55AA) で初期化
-        cs = 0x55AA
-
-        # 2. FSA（開始角度）をXOR
-        fsa = struct.unpack('<H', packet_data[4:6])[0]
-        cs ^= fsa
+        cs = self._header_checksum(packet_data)
 
-        # 3. データ部を2バイトずつXOR（強度なし: 2bytes/点）
+        # データ部をXOR（NumPyの一括リダクションで計算）
         lsn = packet_data[3]
-        data_start = self.HEADER_SIZE
-        bytes_per_point = 3 if self.has_intensity else 2
-        data_size = lsn * bytes_per_point
-
-        if self.has_intensity:
-            # 強度あり: 3バイト/点の場合
-            for i in range(data_start, data_start + data_size, 3):
-                if i + 2 < len(packet_data):
-                    # 強度（1バイト）をXOR
-                    cs ^= packet_data[i]
-                    # 距離（2バイト）をワードとしてXOR
-                    word = struct.unpack('<H', packet_data[i+1:i+3])[0]
-                    cs ^= word
-        else:
-            # 強度なし: 2バイト/点の場合
-            for i in range(data_start, data_start + data_size, 2):
-                if i + 1 < len(packet_data):
-                    word = struct.unpack('<H', packet_data[i:i+2])[0]
-                    cs ^= word
+        points = np.frombuffer(packet_data, dtype=np.uint8, count=lsn * 3, offset=self.HEADER_SIZE).reshape(lsn, 3)
+        # 強度（1バイト）をXOR
+        cs ^= int(np.bitwise_xor.reduce(points[:, 0]))
+        # 距離（2バイト）をワードとしてXOR
+        words = (points[:, 2].astype(np.uint16) << 8) | points[:, 1]
+        cs ^= int(np.bitwise_xor.reduce(words))
 
-        # 4. 最後に (CT + LSN) をワードとしてXOR
-        ct_lsn = struct.unpack('<H', packet_data[2:4])[0]
-        cs ^= ct_lsn
+        return cs == expected_cs
 
-        # 5. LSA（終了角度）をワードとしてXOR
-        lsa = struct.unpack('<H', packet_data[6:8])[0]
-        cs ^= lsa
+    def _verify_checksum_no_intensity(self, packet_data: bytes, expected_cs: int) -> bool:
+        """
+        チェックサムを検証（強度なし: 2バイト/点）
 
-        return cs == expected_cs
+        packet_data に埋め込まれたチェックサム（CSワード）に対して検証する。
+        expected_cs は強度ありの版と呼び出し形式を揃えるためだけの引数で、使用しない。
 
-    def _parse_points(self, data: bytes, lsn: int, fsa: int, lsa: int) -> List[LaserPoint]:
+        Args:
+            packet_data: ヘッダー+データ部（チェックサム含む）
+            expected_cs: 未使用（packet_data 内のCSワードで検証する）
+
+        Returns:
+            チェックサムが正しければTrue
+        """
+        # パケット全体がワード境界に揃っているため、ヘッダー（PH 0x55AA・CSワード含む）と
+        # データ部を1つのワード配列として1回のリダクションでXORする。
+        # CSワードも含めてXORするので、チェックサムが正しければ結果は0になる
+        lsn = packet_data[3]
+        words = np.frombuffer(packet_data, dtype='<u2', count=self.HEADER_SIZE // 2 + lsn)
+        return int(np.bitwise_xor.reduce(words)) == 0
+
+    def _interpolate_angles(self, lsn: int, fsa: int, lsa: int) -> np.ndarray:
         """
-        測定点データをパース
+        各測定点の角度を計算
 
         Args:
-            data: 測定点データ部
             lsn: サンプル点数
             fsa: 開始角度（生データ）
             lsa: 終了角度（生データ）
 
         Returns:
-            LaserPointのリスト
+            角度[度]の配列
         """
-        points = []
-
         # 角度の計算（度単位）
         # FSAとLSAの bit0 は常に1で、これを除いて64で割る
         angle_fsa = (fsa >> 1) / 64.0
@@ -185,62 +248,85 @@ class YDLidarProtocol:
         if angle_diff < 0:
             angle_diff += 360.0
 
-        # 各点をパース
-        for i in range(lsn):
-            # 角度計算（線形補間）
-            if lsn > 1:
-                angle = angle_fsa + (i * angle_diff / (lsn - 1))
-            else:
-                angle = angle_fsa
-
-            # 角度を0-360度の範囲に正規化
-            angle = angle % 360.0
-
-            # 距離と強度の抽出
-            if self.has_intensity:
-                # 強度あり: 3バイト/点
-                offset = i * 3
-                if offset + 2 >= len(data):
-                    break
-
-                s0 = data[offset]       # 強度バイト（下位8bit）
-                s1 = data[offset + 1]   # 距離下位 + 強度上位2bit
-                s2 = data[offset + 2]   # 距離上位
-
-                # 距離抽出（上位14bit）
-                raw_distance = ((s2 << 8) | s1) & 0xFFFC
-                distance_mm = raw_distance / 4.0
-
-                # 強度抽出
-                if self.intensity_bit == 10:
-                    # 10ビットモード
-                    intensity = ((s1 & 0x03) << 8) | s0
-                else:
-                    # 8ビットモード
-                    intensity = s0
-            else:
-                # 強度なし: 2バイト/点
-                offset = i * 2
-                if offset + 1 >= len(data):
-                    break
-
-                s0 = data[offset]
-                s1 = data[offset + 1]
-
-                # 距離抽出
-                raw_distance = (s1 << 8) | s0
-                distance_mm = raw_distance / 4.0
-                intensity = 0
-
-            # mm → m に変換
-            distance_m = distance_mm / 1000.0
-
-            # LaserPointオブジェクト作成
-            point = LaserPoint(
-                angle=angle,
-                distance=distance_m,
-                intensity=intensity
-            )
-            points.append(point)
-
-        return points
+        # 補間係数テーブルを取得（lsnは数種類の値しか取らないため初回のみ生成）
+        t = self._lerp_cache.get(lsn)
+        if t is None:
+            t = np.linspace(0.0, 1.0, lsn)
+            t.flags.writeable = False
+            self._lerp_cache[lsn] = t
+
+        # 各点の角度（線形補間）を0-360度の範囲に正規化
+        return ((angle_fsa + t * angle_diff) % 360.0).astype(np.float32)
+
+    def _parse_points_intensity8(self, data: bytes, lsn: int, fsa: int, lsa: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        測定点データをパース（8ビット強度あり）
+
+        Args:
+            data: 測定点データ部
+            lsn: サンプル点数
+            fsa: 開始角度（生データ）
+            lsa: 終了角度（生データ）
+
+        Returns:
+            (角度[度], 距離[m], 強度) の配列のタプル
+        """
+        # 3バイト/点 [強度][距離下位][距離上位]
+        raw = np.frombuffer(data, dtype=np.uint8, count=lsn * 3).reshape(lsn, 3)
+        intensities = raw[:, 0].astype(np.uint16)
+
+        # 距離抽出（上位14bit）
+        raw_distance = ((raw[:, 2].astype(np.uint16) << 8) | raw[:, 1]) & 0xFFFC
+
+        # 生データ(1/4 mm単位) → m に変換
+        distances = (raw_distance * (0.25 / 1000.0)).astype(np.float32)
+
+        return self._interpolate_angles(lsn, fsa, lsa), distances, intensities
+
+    def _parse_points_intensity10(self, data: bytes, lsn: int, fsa: int, lsa: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        測定点データをパース（10ビット強度あり）
+
+        Args:
+            data: 測定点データ部
+            lsn: サンプル点数
+            fsa: 開始角度（生データ）
+            lsa: 終了角度（生データ）
+
+        Returns:
+            (角度[度], 距離[m], 強度) の配列のタプル
+        """
+        # 3バイト/点 [強度(下位8bit)][距離下位 + 強度上位2bit][距離上位]
+        raw = np.frombuffer(data, dtype=np.uint8, count=lsn * 3).reshape(lsn, 3)
+        s1 = raw[:, 1].astype(np.uint16)
+        intensities = ((s1 & 0x03) << 8) | raw[:, 0]
+
+        # 距離抽出（上位14bit）
+        raw_distance = ((raw[:, 2].astype(np.uint16) << 8) | s1) & 0xFFFC
+
+        # 生データ(1/4 mm単位) → m に変換
+        distances = (raw_distance * (0.25 / 1000.0)).astype(np.float32)
+
+        return self._interpolate_angles(lsn, fsa, lsa), distances, intensities
+
+    def _parse_points_no_intensity(self, data: bytes, lsn: int, fsa: int, lsa: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        測定点データをパース（強度なし）
+
+        Args:
+            data: 測定点データ部
+            lsn: サンプル点数
+            fsa: 開始角度（生データ）
+            lsa: 終了角度（生データ）
+
+        Returns:
+            (角度[度], 距離[m], 強度) の配列のタプル
+        """
+        # 2バイト/点（リトルエンディアン）
+        raw_distance = np.frombuffer(data, dtype='<u2', count=lsn)
+        intensities = np.zeros(lsn, dtype=np.uint16)
+
+        # 生データ(1/4 mm単位) → m に変換
+        distances = (raw_distance * (0.25 / 1000.0)).astype(np.float32)
+
+        return self._interpolate_angles(lsn, fsa, lsa), distances, intensities
@@ -2,49 +2,75 @@
 YDLiDAR T-mini Pro ドライバー
 """
 
+import numpy as np
 import serial
+import struct
+import sys
 import threading
 import time
 from typing import Optional, Callable
-from queue import Queue, Empty
 from .protocol import YDLidarProtocol
 from .types import LaserScan
 
 
+# macOS: 受信データのレイテンシ設定 ioctl（IOKit/serial/ioss.h の _IOW('T', 0, unsigned long)）
+_IOSSDATALAT = 0x80085400
+
+
 class TMiniDriver:
     """YDLiDAR T-mini Pro ドライバークラス"""
 
     # デフォルト設定
     DEFAULT_BAUDRATE = 230400
-    DEFAULT_TIMEOUT = 1.0
+    DEFAULT_TIMEOUT = 0.02  # 読み込みタイムアウト（スキャン停止時に読み込み待ちから抜けるまでの最大時間）
+    BUFFER_SIZE = 8192  # 受信バッファの容量（最大パケット長より十分大きく取る）
+    SCAN_BUFFER_SIZE = 2048  # 1スキャン分の測定点を蓄積する配列の初期容量
 
     def __init__(self,
                  port: str,
                  baudrate: int = DEFAULT_BAUDRATE,
                  has_intensity: bool = True,
-                 intensity_bit: int = 8):
+                 intensity_bit: int = 8,
+                 low_latency: bool = True):
         """
         Args:
             port: シリアルポート (例: '/dev/tty.usbserial-xxxx')
             baudrate: ボーレート (デフォルト: 230400)
             has_intensity: 強度データを使用するか
             intensity_bit: 強度データのビット数 (8 or 10)
+            low_latency: 接続時にシリアルポートの低遅延モードを有効化するか
         """
         self.port = port
         self.baudrate = baudrate
+        self.low_latency = low_latency
         self.serial_conn: Optional[serial.Serial] = None
         self.protocol = YDLidarProtocol(has_intensity, intensity_bit)
 
         # スレッド制御
         self._running = False
         self._thread: Optional[threading.Thread] = None
-        self._scan_queue = Queue(maxsize=10)
+
+        # 最新スキャンの受け渡し（常に最新の1件だけを保持し、古いスキャンは上書きする）
+        self._latest_scan: Optional[LaserScan] = None
+        self._last_returned_scan: Optional[LaserScan] = None
+        self._scan_event = threading.Event()
+
+        # 受信バッファ（固定長で使い回し、_read_pos から _write_pos までが未処理データ）
+        self._buf = bytearray(self.BUFFER_SIZE)
+        self._buf_view = memoryview(self._buf)  # readinto の書き込み先（スライスしてもコピーしない）
+        self._read_pos = 0
+        self._write_pos = 0
 
         # スキャンコールバック
         self._scan_callback: Optional[Callable[[LaserScan], None]] = None
 
+        # 現在のスキャンの測定点（容量が足りなくなったら倍に拡張する蓄積用配列）
+        self._acc_angles = np.empty(self.SCAN_BUFFER_SIZE, dtype=np.float32)
+        self._acc_distances = np.empty(self.SCAN_BUFFER_SIZE, dtype=np.float32)
+        self._acc_intensities = np.empty(self.SCAN_BUFFER_SIZE, dtype=np.uint16)
+        self._acc_count = 0
+
         # スキャン統計
-        self._current_scan_points = []
         self._scan_count = 0
 
     def connect(self) -> bool:
@@ -67,6 +93,10 @@ class TMiniDriver:
                 dsrdtr=False
             )
 
+            # 低遅延モードを有効化
+            if self.low_latency:
+                self._enable_low_latency()
+
             # バッファをクリア
             self.serial_conn.reset_input_buffer()
             self.serial_conn.reset_output_buffer()
@@ -78,6 +108,34 @@ class TMiniDriver:
             print(f"シリアルポート接続エラー: {e}")
             return False
 
+    def _enable_low_latency(self):
+        """
+        シリアルポートの低遅延モードを有効化
+
+        USBシリアル変換の受信データをまとめずに即座に渡すようにする。
+        macOSでは受信レイテンシを1msに設定し、Linuxでは ASYNC_LOW_LATENCY フラグを設定する。
+        非対応の環境やアダプタでは何もしない。
+        """
+        if sys.platform == 'darwin':
+            try:
+                import fcntl
+                # レイテンシはマイクロ秒単位（unsigned long）で指定
+                fcntl.ioctl(self.serial_conn.fd, _IOSSDATALAT, struct.pack('L', 1000))
+            except (ImportError, AttributeError, OSError):
+                pass
+            return
+
+        # pyserialの set_low_latency_mode はPOSIX環境のSerialに定義されているが、
+        # 実装されているのはLinuxのみ（それ以外は NotImplementedError）
+        set_low_latency_mode = getattr(self.serial_conn, 'set_low_latency_mode', None)
+        if set_low_latency_mode is None:
+            return
+
+        try:
+            set_low_latency_mode(True)
+        except (ValueError, NotImplementedError):
+            pass
+
     def disconnect(self):
         """シリアルポートから切断"""
         if self.serial_conn and self.serial_conn.is_open:
@@ -115,37 +173,54 @@ class TMiniDriver:
             self._thread.join(timeout=2.0)
         print("スキャン停止")
 
-    def get_scan(self, timeout: float = 1.0) -> Optional[LaserScan]:
+    def get_scan(self, timeout: Optional[float] = 1.0) -> Optional[LaserScan]:
         """
-        スキャンデータを取得（キューから）
+        最新のスキャンデータを取得
+
+        前回の取得以降に完成したスキャンのうち最新のものを返す（それより古いスキャンは破棄される）。
 
         Args:
-            timeout: タイムアウト時間（秒）
+            timeout: タイムアウト時間（秒）。Noneの場合はスキャンが届くまで待機
 
         Returns:
             LaserScanオブジェクト、またはNone
         """
-        try:
-            return self._scan_queue.get(timeout=timeout)
-        except Empty:
-            return None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            if not self._scan_event.wait(remaining):
+                return None
+            self._scan_event.clear()
+
+            # クリア直後に新しいスキャンが入った場合は同じスキャンを再度通知されるため、
+            # 返却済みのスキャンは読み飛ばして次の通知を待つ
+            scan = self._latest_scan
+            if scan is not None and scan is not self._last_returned_scan:
+                self._last_returned_scan = scan
+                return scan
 
     def _scan_thread(self):
         """スキャンスレッド（バックグラウンド処理）"""
-        buffer = bytearray()
+        self._read_pos = 0
+        self._write_pos = 0
+        needed = YDLidarProtocol.HEADER_SIZE  # 次のヘッダー/パケットが揃うまでに必要なバイト数
 
         while self._running:
             try:
-                # データ読み込み
-                if self.serial_conn.in_waiting > 0:
-                    data = self.serial_conn.read(self.serial_conn.in_waiting)
-                    buffer.extend(data)
+                # バッファ末尾の空きが不足分に満たない場合は、未処理データを先頭に詰める
+                if self.BUFFER_SIZE - self._write_pos < needed:
+                    self._compact_buffer()
+
+                # データ読み込み（受信済みデータと不足分の多い方を要求し、
+                # 不足分が揃うかタイムアウトまで待機してパケット単位でまとめて受信する）
+                # 受信バッファの空き領域に直接書き込む
+                size = min(max(self.serial_conn.in_waiting, needed), self.BUFFER_SIZE - self._write_pos)
+                n = self.serial_conn.readinto(self._buf_view[self._write_pos:self._write_pos + size])
+                if n:
+                    self._write_pos += n
 
                     # パケット処理
-                    self._process_buffer(buffer)
-                else:
-                    # データが無い場合、少し待機
-                    time.sleep(0.001)
+                    needed = self._process_buffer()
 
             except serial.SerialException as e:
                 print(f"シリアル読み込みエラー: {e}")
@@ -154,45 +229,58 @@ class TMiniDriver:
                 print(f"スキャンスレッドエラー: {e}")
                 break
 
-    def _process_buffer(self, buffer: bytearray):
+    def _compact_buffer(self):
+        """受信バッファの未処理データを先頭に移動"""
+        remaining = self._write_pos - self._read_pos
+        self._buf[:remaining] = self._buf[self._read_pos:self._write_pos]
+        self._read_pos = 0
+        self._write_pos = remaining
+
+    def _process_buffer(self) -> int:
         """
-        バッファ内のデータを処理してパケットを抽出
+        受信バッファ内のデータを処理してパケットを抽出
 
-        Args:
-            buffer: 受信データバッファ
+        Returns:
+            次のヘッダーまたはパケット全体が揃うまでに不足しているバイト数
         """
-        while len(buffer) >= YDLidarProtocol.HEADER_SIZE:
+        buf = self._buf
+
+        while self._write_pos - self._read_pos >= YDLidarProtocol.HEADER_SIZE:
             # パケットヘッダーを探す
-            header_idx = self._find_header(buffer)
+            header_idx = self._find_header()
             if header_idx == -1:
-                # ヘッダーが見つからない場合、バッファをクリア
-                buffer.clear()
+                # ヘッダーが見つからない場合、未処理データを破棄
+                # （末尾が 0xAA の場合は、次の受信データとヘッダーを構成する可能性があるため残す）
+                if buf[self._write_pos - 1] == YDLidarProtocol.PACKET_HEADER[0]:
+                    self._read_pos = self._write_pos - 1
+                else:
+                    self._read_pos = self._write_pos
                 break
 
-            # ヘッダーの前のデータを削除
-            if header_idx > 0:
-                del buffer[:header_idx]
+            # ヘッダーの前のデータを読み飛ばす
+            self._read_pos = header_idx
 
             # パケットサイズを予測（最大サイズで試す）
             max_packet_size = YDLidarProtocol.HEADER_SIZE + \
                              (YDLidarProtocol.MAX_POINTS_PER_PACKET * 3)
 
-            if len(buffer) < YDLidarProtocol.HEADER_SIZE:
+            available = self._write_pos - self._read_pos
+            if available < YDLidarProtocol.HEADER_SIZE:
                 # まだヘッダー全体が揃っていない
                 break
 
             # LSN（サンプル点数）を取得してパケットサイズを正確に計算
-            lsn = buffer[3]
-            bytes_per_point = 3 if self.protocol.has_intensity else 2
+            lsn = buf[self._read_pos + 3]
+            bytes_per_point = self.protocol.bytes_per_point
             packet_size = YDLidarProtocol.HEADER_SIZE + (lsn * bytes_per_point)
 
-            if len(buffer) < packet_size:
+            if available < packet_size:
                 # パケット全体が揃っていない
-                break
+                return packet_size - available
 
-            # パケットを抽出
-            packet_data = bytes(buffer[:packet_size])
-            del buffer[:packet_size]
+            # パケットを抽出（コピーせずにバッファを参照する）
+            packet_data = self._buf_view[self._read_pos:self._read_pos + packet_size]
+            self._read_pos += packet_size
 
             # パケットをパース
             result = self.protocol.parse_packet(packet_data)
@@ -200,14 +288,17 @@ class TMiniDriver:
                 scan, is_new_scan = result
 
                 # 測定点を蓄積
-                self._current_scan_points.extend(scan.points)
+                self._accumulate(scan)
 
                 # 零位包（新しいスキャン）の場合、完成したスキャンを出力
-                if is_new_scan and len(self._current_scan_points) > 0:
+                if is_new_scan and self._acc_count > 0:
+                    n = self._acc_count
                     complete_scan = LaserScan(
-                        points=self._current_scan_points,
+                        angles_deg=self._acc_angles[:n].copy(),
+                        distances_m=self._acc_distances[:n].copy(),
+                        intensities=self._acc_intensities[:n].copy(),
                         scan_frequency=scan.scan_frequency,
-                        timestamp=scan.timestamp
+                        timestamp=time.monotonic()
                     )
 
                     # コールバック呼び出し
@@ -217,34 +308,55 @@ class TMiniDriver:
                         except Exception as e:
                             print(f"コールバックエラー: {e}")
 
-                    # キューに追加
-                    try:
-                        self._scan_queue.put_nowait(complete_scan)
-                    except:
-                        # キューが満杯の場合、古いデータを削除
-                        try:
-                            self._scan_queue.get_nowait()
-                            self._scan_queue.put_nowait(complete_scan)
-                        except:
-                            pass
+                    # 最新スキャンを更新して通知
+                    self._latest_scan = complete_scan
+                    self._scan_event.set()
 
                     self._scan_count += 1
-                    self._current_scan_points = []
+                    self._acc_count = 0
+
+        # 未処理データが無くなった場合はバッファの先頭から書き込み直す
+        if self._read_pos == self._write_pos:
+            self._read_pos = 0
+            self._write_pos = 0
 
-    def _find_header(self, buffer: bytearray) -> int:
+        return max(YDLidarProtocol.HEADER_SIZE - (self._write_pos - self._read_pos), 1)
+
+    def _accumulate(self, scan: LaserScan):
         """
-        バッファ内でパケットヘッダーを探す
+        パケットの測定点を現在のスキャンの蓄積用配列に追加
 
         Args:
-            buffer: 検索対象のバッファ
+            scan: パケット1個分のスキャン
+        """
+        start = self._acc_count
+        end = start + len(scan)
+
+        # 容量が足りない場合は倍に拡張（蓄積済みの測定点はコピー）
+        capacity = len(self._acc_distances)
+        if end > capacity:
+            while end > capacity:
+                capacity *= 2
+            for name in ('_acc_angles', '_acc_distances', '_acc_intensities'):
+                old = getattr(self, name)
+                new = np.empty(capacity, dtype=old.dtype)
+                new[:start] = old[:start]
+                setattr(self, name, new)
+
+        self._acc_angles[start:end] = scan.angles_deg
+        self._acc_distances[start:end] = scan.distances_m
+        self._acc_intensities[start:end] = scan.intensities
+        self._acc_count = end
+
+    def _find_header(self) -> int:
+        """
+        受信バッファの未処理データ内でパケットヘッダーを探す
 
         Returns:
             ヘッダーの開始インデックス、見つからない場合は-1
         """
-        for i in range(len(buffer) - 1):
-            if buffer[i] == 0xAA and buffer[i + 1] == 0x55:
-                return i
-        return -1
+        # bytearray.find はC実装の部分列検索（見つからない場合は-1）
+        return self._buf.find(YDLidarProtocol.PACKET_HEADER, self._read_pos, self._write_pos)
 
     def get_scan_count(self) -> int:
         """完了したスキャン数を取得"""
@@ -3,19 +3,28 @@ YDLiDAR T-mini Pro データ型定義
 """
 
 from dataclasses import dataclass
-from typing import List
+from functools import cached_property
+from typing import Iterator, List, Tuple
 import math
 
+import numpy as np
+
 
 @dataclass
 class LaserPoint:
     """LiDARの単一測定点データ"""
+    __slots__ = ('angle', 'distance', 'intensity')  # インスタンス辞書を持たせない（Python 3.8でも使える形で指定）
+
     angle: float      # 角度 (度)
     distance: float   # 距離 (メートル)
     intensity: int    # 信号強度 (0-255 or 0-1023)
 
     def to_cartesian(self):
-        """極座標を直交座標に変換"""
+        """
+        極座標を直交座標に変換
+
+        スキャン全体を変換する場合は、配列でまとめて計算する LaserScan.to_cartesian() を使うこと。
+        """
         angle_rad = math.radians(self.angle)
         x = self.distance * math.cos(angle_rad)
         y = self.distance * math.sin(angle_rad)
@@ -26,16 +35,82 @@ class LaserPoint:
         return self.distance > 0.0
 
 
-@dataclass
+@dataclass(eq=False)
 class LaserScan:
-    """1スキャン分のデータ（複数の測定点）"""
-    points: List[LaserPoint]
-    scan_frequency: float  # スキャン周波数 (Hz)
-    timestamp: float       # タイムスタンプ (秒)
+    """
+    1スキャン分のデータ（複数の測定点）
+
+    測定点は角度・距離・強度の並列なNumPy配列（SoA）として保持する。
+    angles_rad / valid_mask / n_valid は初回アクセス時に計算してキャッシュするため、
+    生成後に配列の中身を書き換えないこと。
+    """
+    angles_deg: np.ndarray   # 角度 (度, float32)
+    distances_m: np.ndarray  # 距離 (メートル, float32)
+    intensities: np.ndarray  # 信号強度 (uint16, 0-255 or 0-1023)
+    scan_frequency: float    # スキャン周波数 (Hz)
+    timestamp: float         # タイムスタンプ (秒, time.monotonic())
+
+    def __post_init__(self):
+        self.angles_deg = np.asarray(self.angles_deg, dtype=np.float32)
+        self.distances_m = np.asarray(self.distances_m, dtype=np.float32)
+        self.intensities = np.asarray(self.intensities, dtype=np.uint16)
+
+    @classmethod
+    def from_points(cls, points: List[LaserPoint], scan_frequency: float, timestamp: float) -> 'LaserScan':
+        """LaserPointのリストから生成"""
+        return cls(
+            angles_deg=[p.angle for p in points],
+            distances_m=[p.distance for p in points],
+            intensities=[p.intensity for p in points],
+            scan_frequency=scan_frequency,
+            timestamp=timestamp
+        )
+
+    @property
+    def points(self) -> List[LaserPoint]:
+        """全測定点をLaserPointのリストとして返す"""
+        return _to_points(self.angles_deg, self.distances_m, self.intensities)
+
+    @cached_property
+    def angles_rad(self) -> np.ndarray:
+        """角度 (ラジアン)"""
+        return np.radians(self.angles_deg)
+
+    @cached_property
+    def valid_mask(self) -> np.ndarray:
+        """有効なポイント（距離 > 0）を示すブール配列"""
+        return self.distances_m > 0.0
+
+    @cached_property
+    def n_valid(self) -> int:
+        """有効なポイントの数"""
+        return int(np.count_nonzero(self.valid_mask))
+
+    def to_cartesian(self) -> Tuple[np.ndarray, np.ndarray]:
+        """全測定点を直交座標に変換（x, y の配列のタプルを返す）"""
+        angles = self.angles_rad
+        return self.distances_m * np.cos(angles), self.distances_m * np.sin(angles)
 
     def get_valid_points(self):
         """有効なポイントのみを返す"""
-        return [p for p in self.points if p.is_valid()]
+        mask = self.valid_mask
+        return _to_points(self.angles_deg[mask], self.distances_m[mask], self.intensities[mask])
+
+    def iter_valid_points(self) -> Iterator[LaserPoint]:
+        """有効なポイントを1点ずつ返す（リストを作らずに走査する場合用）"""
+        mask = self.valid_mask
+        for angle, distance, intensity in zip(self.angles_deg[mask].tolist(),
+                                              self.distances_m[mask].tolist(),
+                                              self.intensities[mask].tolist()):
+            yield LaserPoint(angle=angle, distance=distance, intensity=intensity)
 
     def __len__(self):
-        return len(self.points)
+        return len(self.distances_m)
+
+
+def _to_points(angles_deg: np.ndarray, distances_m: np.ndarray, intensities: np.ndarray) -> List[LaserPoint]:
+    """並列配列からLaserPointのリストを生成"""
+    return [
+        LaserPoint(angle=angle, distance=distance, intensity=intensity)
+        for angle, distance, intensity in zip(angles_deg.tolist(), distances_m.tolist(), intensities.tolist())
+    ]